@@ -0,0 +1,194 @@
+"""LLM Response Cache.
+
+This module provides a response cache for deterministic chat model calls,
+backed by Redis when configured and an in-process LRU cache otherwise.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from functools import cache
+from typing import Any
+
+import orjson
+from cachetools import LRUCache
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import ChatGeneration
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MAXSIZE = 1024
+
+# Message fields that differ between otherwise identical calls
+_VOLATILE_MESSAGE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def _normalize_prompt(prompt: str) -> Any:
+    """Drop per-run message fields from serialized messages.
+
+    Graph reducers give every incoming message a fresh ID, and model replies
+    carry run-specific metadata, so neither may take part in the key.
+    """
+    try:
+        messages = orjson.loads(prompt)
+    except orjson.JSONDecodeError:
+        return prompt
+    if isinstance(messages, list):
+        for message in messages:
+            kwargs = message.get("kwargs") if isinstance(message, dict) else None
+            if isinstance(kwargs, dict):
+                for name in _VOLATILE_MESSAGE_FIELDS:
+                    kwargs.pop(name, None)
+    return messages
+
+
+def _with_fresh_ids(generations: RETURN_VAL_TYPE) -> RETURN_VAL_TYPE:
+    """Copy cached generations, giving each message a new ID.
+
+    Without this, replaying the same reply twice into one thread would make
+    the messages reducer merge the two into one.
+    """
+    return [
+        generation.model_copy(
+            update={
+                "message": generation.message.model_copy(
+                    update={"id": str(uuid.uuid4())}
+                )
+            }
+        )
+        if isinstance(generation, ChatGeneration)
+        else generation
+        for generation in generations
+    ]
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Compute a stable cache key for a model call.
+
+    Args:
+        prompt: Serialized messages sent to the model. Message IDs and
+            response metadata are ignored.
+        llm_string: Serialized model configuration, including the model name,
+            sampling parameters and any bound tools.
+
+    Returns:
+        Hex-encoded SHA-256 digest of the call.
+    """
+    payload = orjson.dumps(
+        {"model": llm_string, "messages": _normalize_prompt(prompt)},
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+class LLMCache(BaseCache):
+    """Cache chat model generations in memory and, optionally, in Redis.
+
+    The in-memory LRU cache is always consulted first. When a Redis URL is
+    provided, misses fall through to Redis and entries are written to both
+    with the configured TTL. Every hit returns messages with fresh IDs.
+    """
+
+    def __init__(
+        self,
+        *,
+        redis_url: str | None = None,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        maxsize: int = DEFAULT_MAXSIZE,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            redis_url: Optional Redis connection URL for a shared cache.
+            ttl: Time-to-live for Redis entries, in seconds.
+            maxsize: Maximum number of entries held in memory.
+        """
+        self.ttl = ttl
+        self._memory: LRUCache[str, RETURN_VAL_TYPE] = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._redis: Any = None
+        if redis_url:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(redis_url)
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """Look up a cached generation in memory."""
+        with self._lock:
+            cached = self._memory.get(cache_key(prompt, llm_string))
+        return None if cached is None else _with_fresh_ids(cached)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store a generation in memory."""
+        with self._lock:
+            self._memory[cache_key(prompt, llm_string)] = return_val
+
+    def clear(self, **kwargs: Any) -> None:
+        """Clear the in-memory cache."""
+        with self._lock:
+            self._memory.clear()
+
+    async def alookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """Look up a cached generation in memory, then in Redis."""
+        key = cache_key(prompt, llm_string)
+        with self._lock:
+            cached = self._memory.get(key)
+        if cached is not None:
+            return _with_fresh_ids(cached)
+        if self._redis is None:
+            return None
+
+        try:
+            raw = await self._redis.get(key)
+        except Exception as exc:
+            logger.warning("LLM cache lookup failed: %s", exc)
+            return None
+        if raw is None:
+            return None
+
+        cached = loads(raw)
+        with self._lock:
+            self._memory[key] = cached
+        return _with_fresh_ids(cached)
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        """Store a generation in memory and in Redis."""
+        key = cache_key(prompt, llm_string)
+        with self._lock:
+            self._memory[key] = return_val
+        if self._redis is None:
+            return
+
+        try:
+            await self._redis.set(key, dumps(return_val), ex=self.ttl)
+        except Exception as exc:
+            logger.warning("LLM cache update failed: %s", exc)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        """Clear the in-memory cache."""
+        self.clear()
+
+
+@cache
+def get_llm_cache() -> LLMCache:
+    """Get the process-wide LLM cache instance."""
+    return LLMCache(
+        redis_url=os.getenv("LLM_CACHE_REDIS_URL"),
+        ttl=int(os.getenv("LLM_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+        maxsize=int(os.getenv("LLM_CACHE_MAXSIZE", DEFAULT_MAXSIZE)),
+    )
+
+
+def get_cache_for_temperature(temperature: float) -> LLMCache | None:
+    """Get the LLM cache when calls at this temperature are deterministic.
+
+    Sampled responses (temperature above zero) are expected to vary between
+    calls, so they are never cached.
+    """
+    return get_llm_cache() if temperature <= 0 else None
@@ -0,0 +1,40 @@
+"""Chat Model Pool.
+
+This module shares chat model instances across requests so each provider
+client, and its HTTP connection pool, is created once per configuration.
+"""
+
+import threading
+
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+
+from agents.core.llm_cache import get_cache_for_temperature
+
+_model_cache: dict[tuple[str, float], BaseChatModel] = {}
+_model_lock = threading.Lock()
+
+
+def get_chat_model(model_name: str, temperature: float) -> BaseChatModel:
+    """Get a shared chat model for the given configuration.
+
+    Args:
+        model_name: Name of the model, as accepted by `init_chat_model`.
+        temperature: Sampling temperature.
+
+    Returns:
+        A chat model instance reused for every call with the same arguments.
+    """
+    key = (model_name, temperature)
+    model = _model_cache.get(key)
+    if model is None:
+        with _model_lock:
+            model = _model_cache.get(key)
+            if model is None:
+                model = init_chat_model(
+                    model=model_name,
+                    temperature=temperature,
+                    cache=get_cache_for_temperature(temperature),
+                )
+                _model_cache[key] = model
+    return model
@@ -4,34 +4,43 @@ This module creates a deep research agent with custom tools and prompts
 for conducting web research with strategic thinking and context management.
 """
 
+import os
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict
+from functools import cache, lru_cache
+from string import Template
+from types import MappingProxyType
+from typing import Any, Dict, Literal, Mapping, cast
 
+from cachetools import LRUCache, TTLCache, cached
 from deepagents import create_deep_agent
 from deepagents.backends.composite import CompositeBackend
-from deepagents_cli.integrations.sandbox_factory import create_sandbox
 from langchain.agents.middleware import (
+    AgentMiddleware,
     ModelCallLimitMiddleware,
     ModelFallbackMiddleware,
     ModelRetryMiddleware,
     ToolCallLimitMiddleware,
     ToolRetryMiddleware,
 )
-from langchain.chat_models import init_chat_model
 from langchain_core.messages import HumanMessage
 from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.runtime import Runtime
+from langgraph.types import Command
 from typing_extensions import Annotated, TypedDict
 
+from agents.core.models import get_chat_model
+from agents.deep.research_agent.middleware import ParallelToolExecutor
 from agents.deep.research_agent.prompts import (
     RESEARCH_WORKFLOW_INSTRUCTIONS,
     RESEARCHER_INSTRUCTIONS,
     SUBAGENT_DELEGATION_INSTRUCTIONS,
 )
+from agents.deep.research_agent.sandbox import pooled_sandbox
 from agents.deep.research_agent.tools import get_all_tools
 
 # Default configuration values
@@ -40,8 +49,24 @@ DEFAULT_TEMPERATURE = 0.0
 DEFAULT_MAX_CONCURRENT_RESEARCH_UNITS = 3
 DEFAULT_MAX_RESEARCHER_ITERATIONS = 3
 
+# Maximum number of tool calls a research sub-agent executes concurrently
+TOOL_CONCURRENCY_LIMIT = int(
+    os.getenv("TOOL_CONCURRENCY_LIMIT", DEFAULT_MAX_CONCURRENT_RESEARCH_UNITS)
+)
+
+# Tool executors shared across runs. The orchestrator and research sub-agents
+# use separate executors so sub-agent tool calls never wait on slots held by
+# the orchestrator's task() calls. Each run binds the orchestrator's limit from
+# max_concurrent_research_units, and every orchestrator tool call rebinds the
+# research executor, so each sub-agent invocation gets a limit of its own.
+_research_tool_executor = ParallelToolExecutor(max_concurrency=TOOL_CONCURRENCY_LIMIT)
+_orchestrator_tool_executor = ParallelToolExecutor(
+    max_concurrency=DEFAULT_MAX_CONCURRENT_RESEARCH_UNITS,
+    nested=[_research_tool_executor],
+)
+
 
-@dataclass
+@dataclass(slots=True)
 class Context:
     """Context parameters for the agent."""
 
@@ -61,56 +86,100 @@ class State(TypedDict):
     research_complete: bool
 
 
+@cached(TTLCache(maxsize=1, ttl=60))
 def _get_current_date() -> str:
     """Get current date formatted for prompts."""
     return datetime.now().strftime("%Y-%m-%d")
 
 
+# Orchestrator instructions prefix and delegation template, prepared once at import
+_INSTRUCTIONS_PREFIX = RESEARCH_WORKFLOW_INSTRUCTIONS + "\n\n" + "=" * 80 + "\n\n"
+_DELEGATION_TEMPLATE = Template(
+    SUBAGENT_DELEGATION_INSTRUCTIONS.replace(
+        "{max_concurrent_research_units}", "$max_concurrent"
+    ).replace("{max_researcher_iterations}", "$max_iterations")
+)
+
+
+@lru_cache(maxsize=16)
 def _build_instructions(max_concurrent: int, max_iterations: int) -> str:
     """Build combined orchestrator instructions."""
-    return (
-        RESEARCH_WORKFLOW_INSTRUCTIONS
-        + "\n\n"
-        + "=" * 80
-        + "\n\n"
-        + SUBAGENT_DELEGATION_INSTRUCTIONS.format(
-            max_concurrent_research_units=max_concurrent,
-            max_researcher_iterations=max_iterations,
-        )
+    return _INSTRUCTIONS_PREFIX + _DELEGATION_TEMPLATE.substitute(
+        max_concurrent=max_concurrent,
+        max_iterations=max_iterations,
     )
 
 
-def _create_research_subagent(current_date: str, tools: list) -> dict:
-    """Create the research sub-agent configuration."""
-    return {
-        "name": "research-agent",
-        "description": "Delegate research to the sub-agent researcher. Only give this researcher one topic at a time.",
-        "system_prompt": RESEARCHER_INSTRUCTIONS.format(date=current_date),
-        "tools": tools,
-    }
+# Research sub-agent configurations keyed on (current_date, id(tools)); the
+# tools list is stored alongside so its id cannot be reused while cached
+_research_subagents: LRUCache[tuple[str, int], tuple[list, Mapping[str, Any]]] = (
+    LRUCache(maxsize=16)
+)
 
 
-async def prepare_research(state: State, runtime: Runtime[Context]) -> Dict[str, Any]:
+def _create_research_subagent(current_date: str, tools: list) -> Mapping[str, Any]:
+    """Create the research sub-agent configuration.
+
+    The configuration is cached per date and tools list, and returned as a
+    read-only mapping so it can be shared safely across invocations. Its
+    executor holds no limit of its own: each sub-agent invocation is bound
+    to a fresh one by the orchestrator's executor.
+    """
+    key = (current_date, id(tools))
+    if key not in _research_subagents:
+        subagent = {
+            "name": "research-agent",
+            "description": "Delegate research to the sub-agent researcher. Only give this researcher one topic at a time.",
+            "system_prompt": RESEARCHER_INSTRUCTIONS.format(date=current_date),
+            "tools": tools,
+            "middleware": [_research_tool_executor],
+        }
+        _research_subagents[key] = (tools, MappingProxyType(subagent))
+    return _research_subagents[key][1]
+
+
+@cache
+def _get_deep_agent_middleware() -> list[AgentMiddleware]:
+    """Build the orchestrator middleware stack once per process.
+
+    Built on first use rather than at import, because ModelFallbackMiddleware
+    initializes its fallback chat model (and needs its API key) when created.
+    The built-in middleware keeps its counters in graph state, so the same
+    instances are safe to share across runs.
+    """
+    return [
+        ModelCallLimitMiddleware(thread_limit=10),
+        ToolCallLimitMiddleware(thread_limit=10),
+        ModelFallbackMiddleware(first_model="gpt-4o-mini"),
+        ModelRetryMiddleware(),
+        _orchestrator_tool_executor,
+        ToolRetryMiddleware(),
+    ]
+
+
+async def prepare_research(
+    state: State, runtime: Runtime[Context]
+) -> Command[Literal["run_deep_agent"]]:
     """Prepare the research query and initialize state."""
-    query = state.get("query", "")
-    messages = state.get("messages", [])
+    query = state.get("query")
+    messages = state.get("messages")
+    update: Dict[str, Any] = {"research_complete": False}
 
     # If query provided but no messages, create initial message
     if query and not messages:
-        messages = [HumanMessage(content=query)]
+        update["messages"] = [HumanMessage(content=query)]
 
-    return {
-        "messages": messages,
-        "research_complete": False,
-    }
+    return Command(update=update, goto="run_deep_agent")
 
 
-async def run_deep_agent(state: State, runtime: Runtime[Context]) -> Dict[str, Any]:
+async def run_deep_agent(
+    state: State, runtime: Runtime[Context]
+) -> Command[Literal["finalize_research"]]:
     """Run the deep research agent."""
-    model_name = runtime.context.model_name
-    temperature = runtime.context.temperature
-    max_concurrent = runtime.context.max_concurrent_research_units
-    max_iterations = runtime.context.max_researcher_iterations
+    ctx = runtime.context
+    model_name, temperature = ctx.model_name, ctx.temperature
+    max_concurrent = ctx.max_concurrent_research_units
+    max_iterations = ctx.max_researcher_iterations
 
     # Build components
     current_date = _get_current_date()
@@ -120,48 +189,64 @@ async def run_deep_agent(state: State, runtime: Runtime[Context]) -> Dict[str, A
     tools = await get_all_tools()
     research_sub_agent = _create_research_subagent(current_date, tools)
 
-    # Initialize model
-    model = init_chat_model(model=model_name, temperature=temperature)
+    # Reuse the shared model for this configuration
+    model = get_chat_model(model_name, temperature)
+
+    # Give this run its own tool concurrency limit
+    _orchestrator_tool_executor.bind_run(max_concurrent)
 
-    # Create and run the deep agent within sandbox context
-    with create_sandbox(
-        provider="daytona",
-        setup_script_path="scripts/sandbox_setup.sh",
-    ) as sandbox_backend:
+    # Create and run the deep agent within a sandbox borrowed from the pool
+    async with pooled_sandbox() as sandbox_backend:
         deep_agent = create_deep_agent(
             model=model,
             tools=tools,
             system_prompt=instructions,
-            middleware=[
-                ModelCallLimitMiddleware(thread_limit=10),
-                ToolCallLimitMiddleware(thread_limit=10),
-                ModelFallbackMiddleware(first_model="gpt-4o-mini"),
-                ModelRetryMiddleware(),
-                ToolRetryMiddleware(),
-            ],
+            middleware=_get_deep_agent_middleware(),
             subagents=[research_sub_agent],
             backend=CompositeBackend(default=sandbox_backend, routes={}),
         )
 
-        # Invoke the deep agent with current messages (must be inside with block)
-        result = await deep_agent.ainvoke({"messages": state["messages"]})
-
-    return {
-        "messages": result.get("messages", []),
-        "research_complete": True,
-    }
+        # Stream the deep agent with current messages (must be inside async with
+        # block), forwarding each step as a custom event and keeping the final state
+        writer = get_stream_writer()
+        result: Dict[str, Any] = {}
+        async for mode, chunk in deep_agent.astream(
+            {"messages": state["messages"]},
+            stream_mode=["updates", "values"],
+        ):
+            if mode == "updates":
+                writer(chunk)
+            else:
+                result = cast(Dict[str, Any], chunk)
+
+    # Only emit messages the deep agent added, so the reducer merges the delta.
+    # Match on ID rather than position: summarization and tool call patching
+    # rewrite the inner history, so its length says nothing about what is new.
+    seen = {message.id for message in state["messages"]}
+    new_messages = [m for m in result.get("messages", []) if m.id not in seen]
+    return Command(
+        update={"messages": new_messages, "research_complete": True},
+        goto="finalize_research",
+    )
 
 
-async def finalize_research(state: State, runtime: Runtime[Context]) -> Dict[str, Any]:
+async def finalize_research(
+    state: State, runtime: Runtime[Context]
+) -> Command[Literal["__end__"]]:
     """Finalize and post-process research results."""
     # Placeholder for any post-processing logic
-    return {"research_complete": True}
+    return Command(update={"research_complete": True}, goto=END)
 
 
 def build_graph(config: RunnableConfig) -> CompiledStateGraph:
     """Build the research agent graph with deterministic nodes."""
     debug = bool(config.get("configurable", {}).get("debug", False))
+    return _compile_graph(debug)
+
 
+@lru_cache(maxsize=2)
+def _compile_graph(debug: bool) -> CompiledStateGraph:
+    """Compile the research agent graph once per debug setting."""
     # Create the graph
     graph = StateGraph(State, context_schema=Context)
 
@@ -170,10 +255,7 @@ def build_graph(config: RunnableConfig) -> CompiledStateGraph:
     graph.add_node(run_deep_agent)
     graph.add_node(finalize_research)
 
-    # Define edges
+    # Define the entry edge; each node routes onward via Command
     graph.add_edge(START, "prepare_research")
-    graph.add_edge("prepare_research", "run_deep_agent")
-    graph.add_edge("run_deep_agent", "finalize_research")
-    graph.add_edge("finalize_research", END)
 
     return graph.compile(name="Research Agent", debug=debug)
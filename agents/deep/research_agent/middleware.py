@@ -0,0 +1,94 @@
+"""Agent Middleware.
+
+This module provides custom middleware for the research deepagent, layered
+on top of the built-in LangChain agent middleware stack.
+"""
+
+import asyncio
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Sequence
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain.agents.middleware.types import ToolCallRequest
+from langchain_core.messages import ToolMessage
+from langgraph.errors import GraphBubbleUp
+from langgraph.types import Command
+
+
+class ParallelToolExecutor(AgentMiddleware):
+    """Run independent tool calls concurrently under a bounded semaphore.
+
+    When the model emits several tool calls in a single turn, the agent's
+    tool node dispatches them together with ``asyncio.gather``. This
+    middleware caps how many of those calls are in flight at once and turns
+    any exception raised by a tool into an error ``ToolMessage`` so that one
+    failing call never cancels its siblings.
+
+    Register it before ``ToolRetryMiddleware`` so retries still apply to each
+    individual call while holding a single concurrency slot.
+
+    A single instance may be shared across runs: call `bind_run` at the start
+    of each run to give that run its own limit. Executors used by sub-agents
+    can be passed as ``nested`` so that every tool call made through this
+    executor, such as a ``task`` call starting a sub-agent, binds them afresh
+    and each sub-agent invocation gets a limit of its own.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        nested: Sequence["ParallelToolExecutor"] = (),
+    ) -> None:
+        """Initialize the executor.
+
+        Args:
+            max_concurrency: Default maximum number of tool calls allowed to
+                run at once.
+            nested: Executors to bind to a new limit for each tool call.
+        """
+        super().__init__()
+        self.max_concurrency = max(1, max_concurrency)
+        self.nested = tuple(nested)
+        self._default_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._run_semaphore: ContextVar[asyncio.Semaphore | None] = ContextVar(
+            "run_semaphore", default=None
+        )
+
+    def bind_run(self, max_concurrency: int | None = None) -> None:
+        """Start a new concurrency limit for the current run.
+
+        Tool calls made from the current context, and from tasks it spawns,
+        share the new limit. Calls outside any bound run share a default one.
+
+        Args:
+            max_concurrency: Limit for this run. Defaults to the limit the
+                executor was created with.
+        """
+        limit = self.max_concurrency if max_concurrency is None else max_concurrency
+        self._run_semaphore.set(asyncio.Semaphore(max(1, limit)))
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        """Execute a single tool call within the concurrency limit."""
+        semaphore = self._run_semaphore.get() or self._default_semaphore
+        async with semaphore:
+            # Each tool call runs in its own task context, so these bindings
+            # only apply to work started by this call
+            for executor in self.nested:
+                executor.bind_run()
+            try:
+                return await handler(request)
+            except GraphBubbleUp:
+                # Interrupts and other control-flow signals must reach the graph
+                raise
+            except Exception as exc:
+                tool_call = request.tool_call
+                return ToolMessage(
+                    content=f"Error executing tool '{tool_call['name']}': {exc}",
+                    name=tool_call["name"],
+                    tool_call_id=tool_call["id"],
+                    status="error",
+                )
@@ -0,0 +1,263 @@
+"""Sandbox Pool.
+
+This module keeps a pool of warm Daytona sandboxes so research runs reuse
+provisioned sandboxes instead of creating and tearing one down per request.
+"""
+
+import asyncio
+import atexit
+import dataclasses
+import logging
+import os
+import posixpath
+import shlex
+import uuid
+from contextlib import ExitStack, asynccontextmanager
+from typing import AsyncIterator
+
+from deepagents.backends.protocol import (
+    EditResult,
+    ExecuteResponse,
+    FileDownloadResponse,
+    FileInfo,
+    FileUploadResponse,
+    GrepMatch,
+    SandboxBackendProtocol,
+    WriteResult,
+)
+from deepagents.backends.sandbox import BaseSandbox
+from deepagents_cli.integrations.sandbox_factory import create_sandbox
+
+logger = logging.getLogger(__name__)
+
+SANDBOX_PROVIDER = "daytona"
+SANDBOX_SETUP_SCRIPT_PATH = "scripts/sandbox_setup.sh"
+SANDBOX_POOL_SIZE = int(os.getenv("SANDBOX_POOL_SIZE", 4))
+
+# Each run works in its own directory under this root, removed when it ends
+SANDBOX_RUNS_DIR = "/tmp/research-runs"
+
+# Idle sandboxes, each with the stack that tears it down, and a slot per
+# sandbox the pool may hold so runs never outnumber the pool
+_sandbox_pool: list[tuple[SandboxBackendProtocol, ExitStack]] = []
+_sandbox_slots = asyncio.Semaphore(SANDBOX_POOL_SIZE)
+_sandbox_pool_lock = asyncio.Lock()
+_sandbox_pool_ready = False
+
+# Stacks of every open sandbox, so those still open are torn down on exit
+_sandbox_stacks: set[ExitStack] = set()
+
+
+@atexit.register
+def _close_sandboxes() -> None:
+    """Tear down every sandbox still open when the interpreter exits."""
+    while _sandbox_stacks:
+        _sandbox_stacks.pop().close()
+
+
+class _RunSandbox(BaseSandbox):
+    """View of a pooled sandbox confined to one run's working directory.
+
+    File paths are resolved under the run directory and commands run from
+    it, so the agent's absolute paths such as ``/final_report.md`` never
+    touch files written by other runs on the same sandbox.
+    """
+
+    def __init__(self, sandbox: SandboxBackendProtocol, root: str) -> None:
+        """Initialize the view.
+
+        Args:
+            sandbox: Pooled sandbox to run commands on.
+            root: Absolute path of the run's working directory.
+        """
+        self._sandbox = sandbox
+        self._root = root
+
+    @property
+    def id(self) -> str:
+        """Unique identifier of the underlying sandbox."""
+        return self._sandbox.id
+
+    def _resolve(self, path: str) -> str:
+        """Map an agent path to its location in the run directory."""
+        return self._root + posixpath.normpath("/" + path).rstrip("/")
+
+    def _unresolve(self, text: str) -> str:
+        """Map run directory locations in text back to agent paths."""
+        return text.replace(self._root + "/", "/").replace(self._root, "/")
+
+    def execute(self, command: str) -> ExecuteResponse:
+        """Execute a command from the run directory."""
+        return self._sandbox.execute(f"cd {shlex.quote(self._root)} && {command}")
+
+    def ls_info(self, path: str) -> list[FileInfo]:
+        """List a directory in the run directory."""
+        return super().ls_info(self._resolve(path))
+
+    def read(self, file_path: str, offset: int = 0, limit: int = 2000) -> str:
+        """Read a file from the run directory."""
+        result = super().read(self._resolve(file_path), offset, limit)
+        if result.startswith("Error: File '"):
+            return f"Error: File '{file_path}' not found"
+        return result
+
+    def write(self, file_path: str, content: str) -> WriteResult:
+        """Create a file in the run directory."""
+        result = super().write(self._resolve(file_path), content)
+        if result.error:
+            return WriteResult(error=self._unresolve(result.error))
+        return dataclasses.replace(result, path=file_path)
+
+    def edit(
+        self,
+        file_path: str,
+        old_string: str,
+        new_string: str,
+        replace_all: bool = False,
+    ) -> EditResult:
+        """Edit a file in the run directory."""
+        result = super().edit(
+            self._resolve(file_path), old_string, new_string, replace_all
+        )
+        if result.error:
+            return EditResult(error=self._unresolve(result.error))
+        return dataclasses.replace(result, path=file_path)
+
+    def grep_raw(
+        self, pattern: str, path: str | None = None, glob: str | None = None
+    ) -> list[GrepMatch] | str:
+        """Search files in the run directory."""
+        matches = super().grep_raw(pattern, self._resolve(path or "/"), glob)
+        if isinstance(matches, str):
+            return matches
+        return [{**match, "path": self._unresolve(match["path"])} for match in matches]
+
+    def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
+        """Match files in the run directory."""
+        return super().glob_info(pattern, self._resolve(path))
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Upload files into the run directory."""
+        responses = self._sandbox.upload_files(
+            [(self._resolve(path), content) for path, content in files]
+        )
+        return [
+            dataclasses.replace(response, path=path)
+            for response, (path, _) in zip(responses, files)
+        ]
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        """Download files from the run directory."""
+        responses = self._sandbox.download_files([self._resolve(p) for p in paths])
+        return [
+            dataclasses.replace(response, path=path)
+            for response, path in zip(responses, paths)
+        ]
+
+
+def _open_sandbox() -> tuple[SandboxBackendProtocol, ExitStack]:
+    """Provision a sandbox that stays open until closed or the process exits."""
+    with ExitStack() as stack:
+        sandbox = stack.enter_context(
+            create_sandbox(
+                provider=SANDBOX_PROVIDER,
+                setup_script_path=SANDBOX_SETUP_SCRIPT_PATH,
+            )
+        )
+        owner = stack.pop_all()
+    _sandbox_stacks.add(owner)
+    return sandbox, owner
+
+
+def _start_run(sandbox: SandboxBackendProtocol, root: str) -> bool:
+    """Create a run directory, reporting whether the sandbox is usable."""
+    try:
+        return sandbox.execute(f"mkdir -p {shlex.quote(root)}").exit_code == 0
+    except Exception as exc:
+        logger.warning("Sandbox %s is unavailable: %s", sandbox.id, exc)
+        return False
+
+
+def _end_run(sandbox: SandboxBackendProtocol, root: str) -> bool:
+    """Remove a run directory, reporting whether the sandbox can be reused."""
+    try:
+        return sandbox.execute(f"rm -rf {shlex.quote(root)}").exit_code == 0
+    except Exception as exc:
+        logger.warning("Failed to reset sandbox %s: %s", sandbox.id, exc)
+        return False
+
+
+async def _discard_sandbox(stack: ExitStack) -> None:
+    """Tear down a sandbox that can no longer be used."""
+    _sandbox_stacks.discard(stack)
+    try:
+        await asyncio.to_thread(stack.close)
+    except Exception as exc:
+        logger.warning("Failed to tear down sandbox: %s", exc)
+
+
+async def _ensure_sandbox_pool() -> None:
+    """Provision the sandbox pool on first use.
+
+    Sandboxes that fail to start are logged and left out of the pool; they
+    are replaced on demand. Fails only when no sandbox could be started.
+    """
+    global _sandbox_pool_ready
+
+    async with _sandbox_pool_lock:
+        if _sandbox_pool_ready:
+            return
+        results = await asyncio.gather(
+            *(asyncio.to_thread(_open_sandbox) for _ in range(SANDBOX_POOL_SIZE)),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        _sandbox_pool.extend(
+            result for result in results if not isinstance(result, BaseException)
+        )
+        for error in errors:
+            logger.warning("Failed to provision sandbox: %s", error)
+        if len(errors) == len(results):
+            raise errors[0]
+        _sandbox_pool_ready = True
+
+
+async def _acquire_sandbox(root: str) -> tuple[SandboxBackendProtocol, ExitStack]:
+    """Take a live sandbox from the pool, provisioning one if none is left."""
+    while _sandbox_pool:
+        sandbox, stack = _sandbox_pool.pop()
+        if await asyncio.to_thread(_start_run, sandbox, root):
+            return sandbox, stack
+        await _discard_sandbox(stack)
+
+    sandbox, stack = await asyncio.to_thread(_open_sandbox)
+    if not await asyncio.to_thread(_start_run, sandbox, root):
+        await _discard_sandbox(stack)
+        raise RuntimeError(f"Sandbox {sandbox.id} failed to start a run")
+    return sandbox, stack
+
+
+@asynccontextmanager
+async def pooled_sandbox() -> AsyncIterator[SandboxBackendProtocol]:
+    """Borrow a warm sandbox from the pool for the duration of a run.
+
+    Waits for a sandbox to become available when all of them are in use. The
+    run works in a fresh directory that is removed before the sandbox goes
+    back to the pool, whether or not the run succeeded. Sandboxes that
+    stopped responding, or could not be reset, are torn down and replaced by
+    a newly provisioned one.
+
+    Yields:
+        A sandbox backend confined to the run's working directory.
+    """
+    await _ensure_sandbox_pool()
+    async with _sandbox_slots:
+        root = f"{SANDBOX_RUNS_DIR}/{uuid.uuid4().hex}"
+        sandbox, stack = await _acquire_sandbox(root)
+        try:
+            yield _RunSandbox(sandbox, root)
+        finally:
+            if await asyncio.to_thread(_end_run, sandbox, root):
+                _sandbox_pool.append((sandbox, stack))
+            else:
+                await _discard_sandbox(stack)
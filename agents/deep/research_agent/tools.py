@@ -4,24 +4,59 @@ This module provides browser automation tools using Browserbase MCP server
 with Stagehand for AI-powered web navigation, extraction, and interaction.
 """
 
+import asyncio
 import os
+from functools import cache
+from typing import Any
 
-from langchain_core.tools import tool
+from cachetools import TTLCache
+from langchain_core.tools import BaseTool, tool
 from langchain_mcp_adapters.client import MultiServerMCPClient
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient
 
+# Browserbase MCP client and tools, resolved once per process
+_mcp_client: MultiServerMCPClient | None = None
+_mcp_tools: list[BaseTool] | None = None
+_mcp_lock = asyncio.Lock()
+_all_tools: list | None = None
 
-def get_tavily_client() -> TavilyClient:
-    """Get the Tavily client instance."""
-    return TavilyClient(api_key=os.environ["TAVILY_API_KEY"])
+# Recent search results and in-flight searches, keyed on (normalized query, max_results)
+_search_cache: TTLCache[tuple[str, int], dict[str, Any]] = TTLCache(
+    maxsize=512, ttl=900
+)
+_inflight: dict[tuple[str, int], asyncio.Task[dict[str, Any]]] = {}
+
+
+@cache
+def get_tavily_client() -> AsyncTavilyClient:
+    """Get the shared async Tavily client instance."""
+    return AsyncTavilyClient(api_key=os.environ["TAVILY_API_KEY"])
 
 
 def get_browserbase_mcp_client() -> MultiServerMCPClient:
     """Get the Browserbase MCP client instance.
 
+    When `BROWSERBASE_MCP_URL` is set, connects to a long-running Browserbase
+    MCP server over streamable HTTP. Otherwise, spawns the server locally over
+    stdio.
+
     Returns:
         MultiServerMCPClient configured for Browserbase Stagehand tools.
     """
+    mcp_url = os.getenv("BROWSERBASE_MCP_URL")
+    if mcp_url:
+        return MultiServerMCPClient(
+            {
+                "browserbase": {
+                    "url": mcp_url,
+                    "headers": {
+                        "Authorization": f"Bearer {os.environ['BROWSERBASE_API_KEY']}",
+                    },
+                    "transport": "streamable_http",
+                },
+            }
+        )
+
     return MultiServerMCPClient(
         {
             "browserbase": {
@@ -51,16 +86,42 @@ async def get_browserbase_tools() -> list:
     - browserbase_session_create: Create a browser session
     - browserbase_session_close: Close the session
 
+    The tool list is fetched from the MCP server on first use and reused for
+    the lifetime of the process. Each tool call still opens its own session.
+
     Returns:
         List of LangChain tools from the Browserbase MCP server.
     """
-    client = get_browserbase_mcp_client()
-    return await client.get_tools()
+    global _mcp_client, _mcp_tools
 
+    async with _mcp_lock:
+        if _mcp_tools is None:
+            _mcp_client = get_browserbase_mcp_client()
+            _mcp_tools = await _mcp_client.get_tools()
+    return _mcp_tools
 
-def internet_search(query: str, max_results: int = 5):
+
+async def _run_search(
+    key: tuple[str, int], query: str, max_results: int
+) -> dict[str, Any]:
+    """Run a Tavily search and cache its result."""
+    try:
+        result = await get_tavily_client().search(query, max_results=max_results)
+        _search_cache[key] = result
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+async def internet_search(query: str, max_results: int = 5) -> dict[str, Any]:
     """Run a web search."""
-    return get_tavily_client().search(query, max_results=max_results)
+    # Reuse recent results and join identical searches that are still running
+    key = (query.strip().lower(), max_results)
+    if key in _search_cache:
+        return _search_cache[key]
+    if key not in _inflight:
+        _inflight[key] = asyncio.create_task(_run_search(key, query, max_results))
+    return await asyncio.shield(_inflight[key])
 
 
 @tool(parse_docstring=True)
@@ -101,9 +162,15 @@ static_tools = [
 async def get_all_tools() -> list:
     """Get all tools including Browserbase MCP tools and static tools.
 
+    The combined list is built once and the same list object is returned on
+    subsequent calls, so callers may key caches on it.
+
     Returns:
         Combined list of MCP browser tools and static tools.
     """
-    client = get_browserbase_mcp_client()
-    mcp_tools = await client.get_tools()
-    return mcp_tools + static_tools
+    global _all_tools
+
+    if _all_tools is None:
+        mcp_tools = await get_browserbase_tools()
+        _all_tools = mcp_tools + static_tools
+    return _all_tools
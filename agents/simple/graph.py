@@ -5,23 +5,25 @@ Returns a predefined response. Replace logic and configuration as needed.
 
 import logging
 from dataclasses import dataclass, field
+from functools import lru_cache
 from operator import add
 from typing import Annotated, Any, Dict
 
-from langchain.chat_models import init_chat_model
 from langchain_core.messages import BaseMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.runtime import Runtime
 
+from agents.core.models import get_chat_model
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_MODEL_NAME = "claude-sonnet-4-5-20250929"
 DEFAULT_TEMPERATURE = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Context:
     """Context parameters for the agent.
 
@@ -49,9 +51,9 @@ async def call_model(state: State, runtime: Runtime[Context]) -> Dict[str, Any]:
 
     Can use runtime context to alter behavior.
     """
-    model_name = runtime.context.model_name
-    temperature = runtime.context.temperature
-    model = init_chat_model(model=model_name, temperature=temperature)
+    ctx = runtime.context
+    model_name, temperature = ctx.model_name, ctx.temperature
+    model = get_chat_model(model_name, temperature)
     response = await model.ainvoke(state.messages)
     return {"messages": [response]}
 
@@ -59,6 +61,12 @@ async def call_model(state: State, runtime: Runtime[Context]) -> Dict[str, Any]:
 def build_graph(config: RunnableConfig) -> CompiledStateGraph:
     """Build the graph."""
     debug = bool(config.get("configurable", {}).get("debug", False))
+    return _compile_graph(debug)
+
+
+@lru_cache(maxsize=2)
+def _compile_graph(debug: bool) -> CompiledStateGraph:
+    """Compile the graph once per debug setting."""
     graph = StateGraph(State, context_schema=Context)
     graph.add_node(call_model)
     graph.add_edge(START, "call_model")
@@ -3,19 +3,36 @@
 import asyncio
 import logging
 import os
+from typing import AsyncIterator
 
-from dotenv import load_dotenv
-from langgraph_sdk import get_client
-from langgraph_sdk.client import LangGraphClient
-from langgraph_sdk.schema import Config, Context
-
-from agents.deep.agent import Context as DeepContext
+import httpx
+from langgraph_sdk.client import LangGraphClient, _get_headers
+from langgraph_sdk.schema import Config, Context, StreamPart
 
 logger = logging.getLogger(__name__)
 
-load_dotenv()
-LANGGRAPH_REMOTE_URL = os.getenv("LANGGRAPH_REMOTE_URL")
-LANGSMITH_API_KEY = os.getenv("LANGSMITH_API_KEY")
+
+def create_client(url: str | None, api_key: str | None) -> LangGraphClient:
+    """Create a LangGraph client that multiplexes requests over HTTP/2."""
+    if url is None:
+        # No remote server configured, so use the SDK's in-process transport
+        from langgraph_sdk import get_client
+
+        return get_client(url=url, api_key=api_key)
+
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    )
+    # Match get_client's timeouts and headers so only the transport differs
+    http = httpx.AsyncClient(
+        base_url=url,
+        transport=transport,
+        timeout=httpx.Timeout(connect=5, read=300, write=300, pool=5),
+        headers=_get_headers(api_key, None),
+    )
+    return LangGraphClient(http)
 
 
 async def get_or_create_assistant(
@@ -40,54 +57,78 @@ async def get_or_create_assistant(
     )
 
 
-async def main() -> None:
-    """Run the main application."""
-    client = get_client(url=LANGGRAPH_REMOTE_URL, api_key=LANGSMITH_API_KEY)
-
-    # Get or create two assistants with different model configurations
-    creative_assistant = await get_or_create_assistant(
-        client,
-        name="Creative Assistant",
-        graph_id="deep",
-        context=DeepContext(
-            model_name="claude-sonnet-4-5-20250929",
-            temperature=0.9,
-        ),
-    )
-    precise_assistant = await get_or_create_assistant(
-        client,
-        name="Precise Assistant",
-        graph_id="deep",
-        context=DeepContext(
-            model_name="gpt-4o-mini",
-            temperature=0.1,
-        ),
-    )
-
-    logger.info("Using assistants: %s, %s", creative_assistant, precise_assistant)
-
-    question = {"messages": [{"role": "human", "content": "What is LangGraph?"}]}
+async def _drain(label: str, stream: AsyncIterator[StreamPart]) -> None:
+    """Log every event from a run stream, prefixed with the assistant label."""
+    async for chunk in stream:
+        logger.info("%s | Event: %s | Data: %s", label, chunk.event, chunk.data)
 
-    # Run both assistants
-    logger.info("--- Creative Assistant (temperature=0.9) ---")
-    async for chunk in client.runs.stream(
-        None,
-        creative_assistant["assistant_id"],
-        input=question,
-        stream_mode="updates",
-    ):
-        logger.info("Event: %s | Data: %s", chunk.event, chunk.data)
 
-    logger.info("--- Precise Assistant (temperature=0.1) ---")
-    async for chunk in client.runs.stream(
-        None,
-        precise_assistant["assistant_id"],
-        input=question,
-        stream_mode="updates",
-    ):
-        logger.info("Event: %s | Data: %s", chunk.event, chunk.data)
+async def main() -> None:
+    """Run the main application."""
+    # Deferred so importing this module does not load the whole agent stack
+    from agents.deep.agent import Context as DeepContext
+
+    async with create_client(
+        os.getenv("LANGGRAPH_REMOTE_URL"), os.getenv("LANGSMITH_API_KEY")
+    ) as client:
+        # Get or create two assistants with different model configurations
+        creative_assistant, precise_assistant = await asyncio.gather(
+            get_or_create_assistant(
+                client,
+                name="Creative Assistant",
+                graph_id="deep",
+                context=DeepContext(
+                    model_name="claude-sonnet-4-5-20250929",
+                    temperature=0.9,
+                ),
+            ),
+            get_or_create_assistant(
+                client,
+                name="Precise Assistant",
+                graph_id="deep",
+                context=DeepContext(
+                    model_name="gpt-4o-mini",
+                    temperature=0.1,
+                ),
+            ),
+        )
+
+        logger.info("Using assistants: %s, %s", creative_assistant, precise_assistant)
+
+        question = {"messages": [{"role": "human", "content": "What is LangGraph?"}]}
+
+        # Run both assistants concurrently
+        await asyncio.gather(
+            _drain(
+                "Creative Assistant (temperature=0.9)",
+                client.runs.stream(
+                    None,
+                    creative_assistant["assistant_id"],
+                    input=question,
+                    stream_mode=["updates", "custom"],
+                ),
+            ),
+            _drain(
+                "Precise Assistant (temperature=0.1)",
+                client.runs.stream(
+                    None,
+                    precise_assistant["assistant_id"],
+                    input=question,
+                    stream_mode=["updates", "custom"],
+                ),
+            ),
+        )
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        # uvloop is not available on Windows
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -55,6 +55,10 @@ class TestBuildGraph:
         graph = build_graph(debug_config)
         assert graph.debug is True
 
+    def test_build_graph_is_reused(self) -> None:
+        """Repeated builds with the same debug setting should share one graph."""
+        assert build_graph(config) is build_graph(config)
+
     def test_graph_has_call_model_node(self) -> None:
         """Graph should contain the call_model node."""
         graph = build_graph(config)
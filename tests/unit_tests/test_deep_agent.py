@@ -0,0 +1,127 @@
+"""Unit tests for the deep research agent graph."""
+
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, RemoveMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from agents.core.llm_cache import LLMCache
+from agents.deep import agent
+
+pytestmark = pytest.mark.anyio
+
+
+def summarizing_agent(**kwargs):
+    """Deep agent stub that replaces its history with a summary and an answer."""
+
+    def respond(state: MessagesState) -> dict:
+        return {
+            "messages": [
+                RemoveMessage(id=REMOVE_ALL_MESSAGES),
+                HumanMessage(content="Summary of the conversation", id="summary"),
+                AIMessage(content="Final answer", id="answer"),
+            ]
+        }
+
+    graph = StateGraph(MessagesState)
+    graph.add_node(respond)
+    graph.add_edge(START, "respond")
+    graph.add_edge("respond", END)
+    return graph.compile()
+
+
+class CountingChatModel(BaseChatModel):
+    """Chat model stub that always answers directly and counts its calls."""
+
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "counting"
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Any = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.calls += 1
+        message = AIMessage(content="LangGraph is a framework for agents.")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "CountingChatModel":
+        return self
+
+
+@pytest.fixture
+def runtime_stub(monkeypatch: pytest.MonkeyPatch) -> None:
+    @asynccontextmanager
+    async def sandbox():
+        yield object()
+
+    async def no_tools() -> list:
+        return []
+
+    monkeypatch.setattr(agent, "pooled_sandbox", sandbox)
+    monkeypatch.setattr(agent, "get_all_tools", no_tools)
+    monkeypatch.setattr(agent, "_get_deep_agent_middleware", lambda: [])
+    monkeypatch.setattr(agent, "CompositeBackend", lambda **kwargs: None)
+
+
+@pytest.fixture
+def deep_agent_stub(monkeypatch: pytest.MonkeyPatch, runtime_stub: None) -> None:
+    monkeypatch.setattr(agent, "create_deep_agent", summarizing_agent)
+    monkeypatch.setattr(agent, "get_chat_model", lambda *args: None)
+
+
+@pytest.fixture
+def cached_model(
+    monkeypatch: pytest.MonkeyPatch, runtime_stub: None
+) -> CountingChatModel:
+    model = CountingChatModel(cache=LLMCache())
+    monkeypatch.setattr(agent, "get_chat_model", lambda *args: model)
+    return model
+
+
+class TestRunDeepAgent:
+    """Tests for merging the deep agent's messages into the graph state."""
+
+    async def test_new_messages_survive_a_shrunken_history(
+        self, deep_agent_stub: None
+    ) -> None:
+        """Messages added after the inner history is rewritten are kept."""
+        history = [
+            HumanMessage(content=f"Question {i}", id=f"question-{i}") for i in range(4)
+        ]
+        result = await agent.build_graph({}).ainvoke(
+            {"messages": history}, context=agent.Context()
+        )
+        assert [m.id for m in result["messages"]] == [
+            *(m.id for m in history),
+            "summary",
+            "answer",
+        ]
+        assert result["research_complete"] is True
+
+    async def test_repeated_question_is_served_from_cache(
+        self, cached_model: CountingChatModel
+    ) -> None:
+        """A second run with the same question should not call the model."""
+        graph = agent.build_graph({})
+        results = [
+            await graph.ainvoke(
+                {"messages": [HumanMessage(content="What is LangGraph?")]},
+                context=agent.Context(temperature=0.0),
+            )
+            for _ in range(2)
+        ]
+        assert cached_model.calls == 1
+        first, second = (result["messages"][-1] for result in results)
+        assert first.content == second.content
+        assert first.id != second.id
@@ -0,0 +1,98 @@
+"""Unit tests for the LLM response cache."""
+
+import pytest
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration
+
+from agents.core.llm_cache import LLMCache, cache_key, get_cache_for_temperature
+
+pytestmark = pytest.mark.anyio
+
+
+class TestCacheKey:
+    """Tests for the cache_key function."""
+
+    def test_cache_key_is_stable(self) -> None:
+        """Identical calls should produce identical keys."""
+        assert cache_key("prompt", "llm") == cache_key("prompt", "llm")
+
+    def test_cache_key_depends_on_model(self) -> None:
+        """Different model configurations should produce different keys."""
+        assert cache_key("prompt", "llm-a") != cache_key("prompt", "llm-b")
+
+    def test_cache_key_ignores_message_ids_and_metadata(self) -> None:
+        """Per-run message fields should not change the key."""
+        first = dumps(
+            [
+                HumanMessage(content="What is LangGraph?", id="a"),
+                AIMessage(
+                    content="A framework.",
+                    id="b",
+                    response_metadata={"request_id": "1"},
+                    usage_metadata={
+                        "input_tokens": 1,
+                        "output_tokens": 2,
+                        "total_tokens": 3,
+                    },
+                ),
+            ]
+        )
+        second = dumps(
+            [
+                HumanMessage(content="What is LangGraph?", id="c"),
+                AIMessage(content="A framework.", id="d"),
+            ]
+        )
+        assert cache_key(first, "llm") == cache_key(second, "llm")
+
+    def test_cache_key_depends_on_message_content(self) -> None:
+        """Different messages should produce different keys."""
+        first = dumps([HumanMessage(content="What is LangGraph?")])
+        second = dumps([HumanMessage(content="What is LangChain?")])
+        assert cache_key(first, "llm") != cache_key(second, "llm")
+
+
+class TestLLMCache:
+    """Tests for the in-memory LLMCache backend."""
+
+    async def test_round_trip(self) -> None:
+        """Stored generations should be returned on lookup."""
+        llm_cache = LLMCache()
+        generations = [ChatGeneration(message=AIMessage(content="hi", id="reply"))]
+        assert await llm_cache.alookup("prompt", "llm") is None
+        await llm_cache.aupdate("prompt", "llm", generations)
+        cached = await llm_cache.alookup("prompt", "llm")
+        assert cached is not None
+        assert [g.text for g in cached] == ["hi"]
+
+    async def test_hits_return_fresh_message_ids(self) -> None:
+        """Each hit should carry a new message ID."""
+        llm_cache = LLMCache()
+        generations = [ChatGeneration(message=AIMessage(content="hi", id="reply"))]
+        await llm_cache.aupdate("prompt", "llm", generations)
+        first = await llm_cache.alookup("prompt", "llm")
+        second = await llm_cache.alookup("prompt", "llm")
+        assert first is not None and second is not None
+        ids = {g.message.id for g in [*first, *second] if isinstance(g, ChatGeneration)}
+        assert len(ids) == 2 and "reply" not in ids
+
+    async def test_evicts_least_recently_used(self) -> None:
+        """The in-memory cache should respect its maximum size."""
+        llm_cache = LLMCache(maxsize=1)
+        generations = [ChatGeneration(message=AIMessage(content="hi"))]
+        await llm_cache.aupdate("first", "llm", generations)
+        await llm_cache.aupdate("second", "llm", generations)
+        assert await llm_cache.alookup("first", "llm") is None
+
+
+class TestGetCacheForTemperature:
+    """Tests for the temperature guard."""
+
+    def test_deterministic_calls_are_cached(self) -> None:
+        """Temperature zero should use the shared cache."""
+        assert isinstance(get_cache_for_temperature(0.0), LLMCache)
+
+    def test_sampled_calls_are_not_cached(self) -> None:
+        """Positive temperatures should bypass the cache."""
+        assert get_cache_for_temperature(0.9) is None
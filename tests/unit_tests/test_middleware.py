@@ -0,0 +1,108 @@
+"""Unit tests for the research agent middleware."""
+
+import asyncio
+
+import pytest
+from langchain.agents.middleware.types import ToolCallRequest
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import tool
+from langgraph.errors import GraphInterrupt
+from langgraph.prebuilt import ToolRuntime
+
+from agents.deep.research_agent.middleware import ParallelToolExecutor
+
+pytestmark = pytest.mark.anyio
+
+
+@tool
+def search() -> str:
+    """Search stub."""
+    return "ok"
+
+
+def make_request(call_id: str = "call-1") -> ToolCallRequest:
+    state: dict = {}
+    return ToolCallRequest(
+        tool_call={"name": "search", "args": {}, "id": call_id},
+        tool=search,
+        state=state,
+        runtime=ToolRuntime(
+            state=state,
+            context=None,
+            config={},
+            stream_writer=lambda chunk: None,
+            tool_call_id=call_id,
+            store=None,
+        ),
+    )
+
+
+class ConcurrencyProbe:
+    """Tool handler that records the peak number of concurrent calls."""
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, request: ToolCallRequest) -> ToolMessage:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return ToolMessage(content="ok", tool_call_id=request.tool_call["id"])
+
+
+class TestParallelToolExecutor:
+    """Tests for ParallelToolExecutor."""
+
+    async def test_exception_becomes_error_tool_message(self) -> None:
+        """A failing tool should produce an error ToolMessage."""
+
+        async def fail(request: ToolCallRequest) -> ToolMessage:
+            raise ValueError("boom")
+
+        result = await ParallelToolExecutor(1).awrap_tool_call(make_request(), fail)
+        assert isinstance(result, ToolMessage)
+        assert result.status == "error"
+        assert result.tool_call_id == "call-1"
+        assert "boom" in result.content
+
+    async def test_graph_bubble_up_is_reraised(self) -> None:
+        """Interrupts should propagate to the graph."""
+
+        async def interrupt(request: ToolCallRequest) -> ToolMessage:
+            raise GraphInterrupt()
+
+        with pytest.raises(GraphInterrupt):
+            await ParallelToolExecutor(1).awrap_tool_call(make_request(), interrupt)
+
+    async def test_concurrency_is_capped(self) -> None:
+        """No more than the bound limit of calls should run at once."""
+        executor = ParallelToolExecutor(5)
+        executor.bind_run(2)
+        probe = ConcurrencyProbe()
+        await asyncio.gather(
+            *(
+                executor.awrap_tool_call(make_request(f"call-{i}"), probe)
+                for i in range(6)
+            )
+        )
+        assert probe.peak == 2
+
+    async def test_nested_executor_is_bound_per_call(self) -> None:
+        """Each outer call should give nested calls a limit of their own."""
+        nested = ParallelToolExecutor(1)
+        outer = ParallelToolExecutor(3, nested=[nested])
+        outer.bind_run()
+        probe = ConcurrencyProbe()
+
+        async def start_subagent(request: ToolCallRequest) -> ToolMessage:
+            return await nested.awrap_tool_call(request, probe)
+
+        await asyncio.gather(
+            *(
+                outer.awrap_tool_call(make_request(f"call-{i}"), start_subagent)
+                for i in range(3)
+            )
+        )
+        assert probe.peak == 3
@@ -0,0 +1,149 @@
+"""Unit tests for the research sandbox pool."""
+
+import asyncio
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from deepagents.backends.protocol import ExecuteResponse
+from deepagents.backends.sandbox import BaseSandbox
+
+from agents.deep.research_agent import sandbox
+
+pytestmark = pytest.mark.anyio
+
+
+class LocalSandbox(BaseSandbox):
+    """Sandbox stub that runs commands on the local machine."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.alive = True
+        self.closed = False
+
+    @property
+    def id(self) -> str:
+        return self.name
+
+    def execute(self, command: str) -> ExecuteResponse:
+        if not self.alive:
+            raise ConnectionError("sandbox is stopped")
+        result = subprocess.run(
+            command, shell=True, capture_output=True, text=True, check=False
+        )
+        return ExecuteResponse(
+            output=result.stdout + result.stderr, exit_code=result.returncode
+        )
+
+    def upload_files(self, files):
+        raise NotImplementedError
+
+    def download_files(self, paths):
+        raise NotImplementedError
+
+
+class SandboxProvider:
+    """Stand-in for create_sandbox that records every sandbox it starts."""
+
+    def __init__(self) -> None:
+        self.created: list[LocalSandbox] = []
+        self.failures = 0
+
+    def get(self, sandbox_id: str) -> LocalSandbox:
+        """Get the sandbox with the given ID."""
+        return next(backend for backend in self.created if backend.id == sandbox_id)
+
+    @contextmanager
+    def __call__(self, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("provisioning failed")
+        backend = LocalSandbox(f"sandbox-{len(self.created)}")
+        self.created.append(backend)
+        try:
+            yield backend
+        finally:
+            backend.closed = True
+
+
+@pytest.fixture
+def provider(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> SandboxProvider:
+    provider = SandboxProvider()
+    monkeypatch.setattr(sandbox, "create_sandbox", provider)
+    monkeypatch.setattr(sandbox, "SANDBOX_POOL_SIZE", 2)
+    monkeypatch.setattr(sandbox, "SANDBOX_RUNS_DIR", str(tmp_path))
+    monkeypatch.setattr(sandbox, "_sandbox_slots", asyncio.Semaphore(2))
+    monkeypatch.setattr(sandbox, "_sandbox_pool", [])
+    monkeypatch.setattr(sandbox, "_sandbox_pool_ready", False)
+    monkeypatch.setattr(sandbox, "_sandbox_stacks", set())
+    return provider
+
+
+class TestPooledSandbox:
+    """Tests for pooled_sandbox."""
+
+    async def test_runs_do_not_see_each_others_files(
+        self, provider: SandboxProvider, tmp_path: Path
+    ) -> None:
+        """Files written in one run should be gone in the next."""
+        async with sandbox.pooled_sandbox() as backend:
+            assert backend.write("/final_report.md", "secret").error is None
+            assert "secret" in backend.read("/final_report.md")
+        async with sandbox.pooled_sandbox() as backend:
+            assert "not found" in backend.read("/final_report.md")
+        assert list(tmp_path.iterdir()) == []
+        assert len(provider.created) == 2
+
+    async def test_partial_provisioning_failure_keeps_started_sandboxes(
+        self, provider: SandboxProvider
+    ) -> None:
+        """Sandboxes that started should be pooled when others fail."""
+        provider.failures = 1
+        async with sandbox.pooled_sandbox():
+            pass
+        assert len(provider.created) == 1
+        assert sandbox._sandbox_pool_ready
+
+    async def test_provisioning_failure_is_raised_when_nothing_started(
+        self, provider: SandboxProvider
+    ) -> None:
+        """The pool should fail, and retry later, when no sandbox started."""
+        provider.failures = 2
+        with pytest.raises(RuntimeError):
+            async with sandbox.pooled_sandbox():
+                pass
+        assert not sandbox._sandbox_pool_ready
+
+    async def test_stopped_sandbox_is_replaced(self, provider: SandboxProvider) -> None:
+        """A sandbox that stopped responding should be torn down and replaced."""
+        await sandbox._ensure_sandbox_pool()
+        for backend in provider.created:
+            backend.alive = False
+        async with sandbox.pooled_sandbox() as backend:
+            assert backend.id == "sandbox-2"
+        assert all(backend.closed for backend in provider.created[:2])
+        assert len(sandbox._sandbox_stacks) == 1
+
+    async def test_failed_run_returns_sandbox_to_pool(
+        self, provider: SandboxProvider, tmp_path: Path
+    ) -> None:
+        """A sandbox whose run failed should be reset and reused."""
+        with pytest.raises(ValueError):
+            async with sandbox.pooled_sandbox() as backend:
+                backend.write("/final_report.md", "partial")
+                raise ValueError("run failed")
+        assert not any(b.closed for b in provider.created)
+        assert len(sandbox._sandbox_pool) == 2
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_reset_failure_does_not_fail_the_run(
+        self, provider: SandboxProvider
+    ) -> None:
+        """A reset error should be logged and the sandbox discarded."""
+        async with sandbox.pooled_sandbox() as backend:
+            local = provider.get(backend.id)
+            local.alive = False
+        assert local.closed
+        assert len(sandbox._sandbox_pool) == 1
+        assert len(sandbox._sandbox_stacks) == 1
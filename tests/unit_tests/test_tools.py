@@ -0,0 +1,60 @@
+"""Unit tests for the research agent tools."""
+
+import asyncio
+
+import pytest
+
+from agents.deep.research_agent import tools
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeTavilyClient:
+    """Tavily client stub that counts searches."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def search(self, query: str, max_results: int) -> dict:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"query": query, "results": []}
+
+
+@pytest.fixture
+def tavily_client(monkeypatch: pytest.MonkeyPatch) -> FakeTavilyClient:
+    client = FakeTavilyClient()
+    monkeypatch.setattr(tools, "get_tavily_client", lambda: client)
+    tools._search_cache.clear()
+    return client
+
+
+class TestInternetSearch:
+    """Tests for internet_search deduplication."""
+
+    async def test_concurrent_duplicates_share_one_search(
+        self, tavily_client: FakeTavilyClient
+    ) -> None:
+        """Identical searches in flight should be coalesced."""
+        results = await asyncio.gather(
+            tools.internet_search("LangGraph"),
+            tools.internet_search("  langgraph "),
+        )
+        assert tavily_client.calls == 1
+        assert results[0] == results[1]
+
+    async def test_repeated_search_is_cached(
+        self, tavily_client: FakeTavilyClient
+    ) -> None:
+        """A repeated search should be served from the cache."""
+        await tools.internet_search("LangGraph")
+        await tools.internet_search("LangGraph")
+        assert tavily_client.calls == 1
+
+    async def test_max_results_is_part_of_the_key(
+        self, tavily_client: FakeTavilyClient
+    ) -> None:
+        """Searches with different result limits should not share results."""
+        await tools.internet_search("LangGraph", max_results=5)
+        await tools.internet_search("LangGraph", max_results=10)
+        assert tavily_client.calls == 2